@@ -68,7 +68,7 @@ def render_crawl_section():
     with col1:
         max_pages = st.number_input("每个网站最大爬取页面数", 1, 20, value=5)
     with col2:
-        delay = st.number_input("页面间隔秒数", 0.0, 5.0, value=1.0, step=0.5)
+        delay = st.number_input("初始页面间隔秒数", 0.0, 5.0, value=1.0, step=0.5)
     with col3:
         timeout = st.number_input("请求超时（秒）", 5, 60, value=12)
 
@@ -0,0 +1,96 @@
+"""
+Peak memory of collecting crawl results for N sites (default 100k).
+
+Compares the previous pipeline (regular dataclass with sets and full error
+strings, kept in a list and converted through asdict) against the compact
+PageResult + ResultColumns path. No network access is needed.
+
+    python benchmarks/bench_result_memory.py [sites]
+"""
+
+import sys
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List, Set
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils import PageResult, ResultColumns, intern_error_code  # noqa: E402
+
+
+@dataclass
+class LegacyPageResult:
+    url: str
+    emails: Set[str]
+    social_links: dict
+    visited_pages: int
+    errors: List[str]
+
+
+def _site(i: int) -> tuple[str, list[str], dict[str, list[str]], list[str]]:
+    url = f"https://site{i}.example.com"
+    emails = [f"info@site{i}.example.com"] if i % 3 else []
+    social = {"facebook": [f"https://facebook.com/site{i}"]} if i % 2 else {}
+    pages = [f"{url}/contact"] if i % 4 == 0 else []
+    return url, emails, social, pages
+
+
+def legacy(sites: int) -> pd.DataFrame:
+    results = []
+    for i in range(sites):
+        url, emails, social, pages = _site(i)
+        results.append(
+            LegacyPageResult(
+                url=url,
+                emails=set(emails),
+                social_links={k: sorted(v) for k, v in social.items()},
+                visited_pages=3,
+                errors=[f"{page}: HTTP 404" for page in pages],
+            )
+        )
+    rows = []
+    for result in results:
+        row = asdict(result)
+        row["emails"] = sorted(result.emails)
+        row["error"] = "\n".join(result.errors)
+        row.pop("errors", None)
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def compact(sites: int) -> pd.DataFrame:
+    columns = ResultColumns()
+    for i in range(sites):
+        url, emails, social, pages = _site(i)
+        columns.append(
+            PageResult(
+                url=url,
+                emails=tuple(emails),
+                social_links={k: tuple(v) for k, v in social.items()},
+                visited_pages=3,
+                errors=tuple((page, intern_error_code("HTTP 404")) for page in pages),
+            )
+        )
+    return columns.to_frame()
+
+
+def measure(build, sites: int) -> float:
+    tracemalloc.start()
+    frame = build(sites)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del frame
+    return peak / (1024 * 1024)
+
+
+def main() -> None:
+    sites = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    for name, build in (("legacy", legacy), ("compact", compact)):
+        print(f"{name:8s} peak {measure(build, sites):8.1f} MiB for {sites} sites")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,12 @@ from __future__ import annotations
 
 import time
 from collections import deque
-from dataclasses import asdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import Iterable, List
 from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
 
 import pandas as pd
 import requests
@@ -13,13 +16,177 @@ from bs4 import BeautifulSoup
 from utils import (
     DEFAULT_HEADERS,
     PageResult,
+    ResultColumns,
     discover_candidate_links,
     extract_emails_from_soup,
     extract_social_links,
+    intern_error_code,
     normalize_url,
 )
 
 
+# Robots.txt failures that mean the whole host is out of reach, not just that path.
+UNREACHABLE_ERRORS = frozenset({"DNS", "ConnectionRefused", "SSLError"})
+
+
+def _is_backoff_status(status: int | None) -> bool:
+    return status is None or status == 429 or status >= 500
+
+
+def _is_retryable_error(code: str) -> bool:
+    if code.startswith("HTTP "):
+        return _is_backoff_status(int(code[5:]))
+    return code == "Timeout"
+
+
+def _site_host(url: str) -> str:
+    netloc = urlparse(url).netloc.lower()
+    if netloc.startswith("www."):
+        netloc = netloc[4:]
+    return netloc
+
+
+@dataclass
+class HostScheduler:
+    """
+    Per-host politeness scheduler driven by server feedback.
+
+    ``delay`` is the starting interval for every host. Slow or failing hosts
+    (429/5xx, network errors) back off exponentially up to ``max_delay``;
+    fast healthy responses shrink the interval toward ``min_delay``. A
+    ``Retry-After`` header or a robots.txt ``Crawl-delay`` always wins over
+    the adaptive value; a ``Retry-After`` longer than ``max_delay`` halts the
+    host instead of being cut short.
+    """
+
+    delay: float = 1.0
+    min_delay: float = 0.2
+    max_delay: float = 60.0
+    fast_response: float = 0.5
+    backoff_factor: float = 2.0
+    speedup_factor: float = 0.8
+    _delays: dict[str, float] = field(default_factory=dict, repr=False)
+    _floors: dict[str, float] = field(default_factory=dict, repr=False)
+    _next_allowed: dict[str, float] = field(default_factory=dict, repr=False)
+    _last_request: dict[str, float] = field(default_factory=dict, repr=False)
+    _halted: set[str] = field(default_factory=set, repr=False)
+
+    @staticmethod
+    def _host(url: str) -> str:
+        # Same notion of "site" as _same_domain, so www./bare hosts share one slot.
+        return _site_host(url)
+
+    def _floor(self, host: str) -> float:
+        # A start delay below min_delay (e.g. 0) lowers the floor with it.
+        return self._floors.get(host, min(self.min_delay, self.delay))
+
+    def robots_checked(self, url: str) -> bool:
+        return self._host(url) in self._floors
+
+    def set_crawl_delay(self, url: str, crawl_delay: float | None) -> None:
+        host = self._host(url)
+        floor = min(self.min_delay, self.delay)
+        if crawl_delay:
+            floor = max(floor, min(float(crawl_delay), self.max_delay))
+        self._floors[host] = floor
+        self._delays[host] = max(self._delays.get(host, self.delay), floor)
+        if host in self._last_request:
+            # robots.txt itself was already scheduled with the old, lower delay.
+            self._next_allowed[host] = max(
+                self._next_allowed.get(host, 0.0),
+                self._last_request[host] + self._delays[host],
+            )
+
+    def halted(self, url: str) -> bool:
+        return self._host(url) in self._halted
+
+    def current_delay(self, url: str) -> float:
+        host = self._host(url)
+        return self._delays.get(host, max(self.delay, self._floor(host)))
+
+    def forget(self, url: str) -> None:
+        host = self._host(url)
+        self._delays.pop(host, None)
+        self._floors.pop(host, None)
+        self._next_allowed.pop(host, None)
+        self._last_request.pop(host, None)
+        self._halted.discard(host)
+
+    def wait(self, url: str) -> None:
+        remaining = self._next_allowed.get(self._host(url), 0.0) - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def record(
+        self,
+        url: str,
+        status: int | None,
+        elapsed: float,
+        retry_after: float | None = None,
+    ) -> None:
+        """Adjust the host interval after a request; ``status`` is None on network errors."""
+        host = self._host(url)
+        floor = self._floor(host)
+        current = self.current_delay(url)
+        now = time.monotonic()
+
+        if _is_backoff_status(status):
+            current = min(self.max_delay, max(current * self.backoff_factor, floor, 1.0))
+        elif status < 400 and elapsed <= self.fast_response:
+            current = max(floor, current * self.speedup_factor)
+
+        self._delays[host] = current
+        wait_for = current
+        if retry_after is not None:
+            if retry_after > self.max_delay:
+                # Waiting that long would stall the batch; give up on the host instead.
+                self._halted.add(host)
+            wait_for = max(wait_for, retry_after)
+        self._last_request[host] = now
+        self._next_allowed[host] = now + wait_for
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def _error_code(exc: Exception) -> str:
+    """Collapse a request failure into a short, interned error code."""
+    if isinstance(exc, requests.Timeout):
+        return intern_error_code("Timeout")
+    if isinstance(exc, requests.exceptions.SSLError):
+        return intern_error_code("SSLError")
+    if isinstance(exc, requests.exceptions.ProxyError):
+        return intern_error_code("ProxyError")
+    if isinstance(exc, requests.ConnectionError):
+        message = str(exc)
+        dns_markers = (
+            "NameResolutionError",
+            "Name or service not known",
+            "getaddrinfo",
+            "nodename nor servname",
+        )
+        if any(marker in message for marker in dns_markers):
+            return intern_error_code("DNS")
+        if "Connection refused" in message or "ConnectionRefusedError" in message:
+            return intern_error_code("ConnectionRefused")
+        return intern_error_code("ConnectionError")
+    if isinstance(exc, requests.TooManyRedirects):
+        return intern_error_code("TooManyRedirects")
+    return intern_error_code(type(exc).__name__)
+
+
 def _build_session(timeout: int = 12) -> requests.Session:
     session = requests.Session()
     session.headers.update(DEFAULT_HEADERS)
@@ -27,31 +194,80 @@ def _build_session(timeout: int = 12) -> requests.Session:
     return session
 
 
-def _fetch_html(session: requests.Session, url: str, timeout: int = 12) -> tuple[str | None, str | None]:
+def _request(
+    session: requests.Session,
+    url: str,
+    timeout: int = 12,
+    scheduler: HostScheduler | None = None,
+) -> tuple[requests.Response | None, str | None]:
+    """GET through the scheduler so every request waits its turn and feeds back its outcome."""
+    if scheduler is not None:
+        scheduler.wait(url)
+    started = time.monotonic()
     try:
         response = session.get(url, timeout=timeout, allow_redirects=True)
-        if response.status_code >= 400:
-            return None, f"{url}: HTTP {response.status_code}"
-        content_type = response.headers.get("Content-Type", "")
-        if "text/html" not in content_type and "application/xhtml" not in content_type:
-            return None, f"{url}: 非HTML内容（{content_type or '未知类型'}）"
+    except Exception as exc:  # noqa: BLE001
+        if scheduler is not None:
+            scheduler.record(url, None, time.monotonic() - started)
+        return None, _error_code(exc)
+    if scheduler is not None:
+        scheduler.record(
+            url,
+            response.status_code,
+            time.monotonic() - started,
+            _parse_retry_after(response.headers.get("Retry-After")),
+        )
+    return response, None
+
+
+def _fetch_crawl_delay(
+    session: requests.Session,
+    url: str,
+    timeout: int = 12,
+    scheduler: HostScheduler | None = None,
+) -> tuple[float | None, str | None]:
+    """Return (crawl_delay, error); error is the failure code when robots.txt could not be read."""
+    parsed = urlparse(url)
+    robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
+    response, error = _request(session, robots_url, timeout=timeout, scheduler=scheduler)
+    if error:
+        return None, error
+    if response.status_code >= 400:
+        return None, intern_error_code(f"HTTP {response.status_code}")
+    try:
+        parser = RobotFileParser(robots_url)
+        parser.parse(response.text.splitlines())
+        crawl_delay = parser.crawl_delay(DEFAULT_HEADERS["User-Agent"])
+        return (float(crawl_delay) if crawl_delay is not None else None), None
+    except Exception:  # noqa: BLE001
+        return None, None
+
+
+def _fetch_html(
+    session: requests.Session,
+    url: str,
+    timeout: int = 12,
+    scheduler: HostScheduler | None = None,
+) -> tuple[str | None, str | None]:
+    response, error = _request(session, url, timeout=timeout, scheduler=scheduler)
+    if error:
+        return None, error
+    if response.status_code >= 400:
+        return None, intern_error_code(f"HTTP {response.status_code}")
+    content_type = response.headers.get("Content-Type", "").split(";", 1)[0].strip()
+    if "text/html" not in content_type and "application/xhtml" not in content_type:
+        return None, intern_error_code(f"非HTML内容（{content_type or '未知类型'}）")
+    try:
         response.encoding = response.apparent_encoding
         return response.text, None
-    except requests.RequestException as exc:
-        return None, f"{url}: {exc}"
     except Exception as exc:  # noqa: BLE001
-        return None, f"{url}: {exc}"
+        return None, _error_code(exc)
 
 
 def _same_domain(target: str, base: str) -> bool:
     try:
-        t_netloc = urlparse(target).netloc.lower()
-        b_netloc = urlparse(base).netloc.lower()
-        if t_netloc.startswith("www."):
-            t_netloc = t_netloc[4:]
-        if b_netloc.startswith("www."):
-            b_netloc = b_netloc[4:]
-        return t_netloc == b_netloc and bool(t_netloc)
+        t_netloc = _site_host(target)
+        return t_netloc == _site_host(base) and bool(t_netloc)
     except Exception:
         return False
 
@@ -61,14 +277,30 @@ def crawl_single_site(
     max_pages: int = 5,
     delay: float = 1.0,
     timeout: int = 12,
+    scheduler: HostScheduler | None = None,
 ) -> PageResult:
     session = _build_session(timeout=timeout)
     start_url = normalize_url(url)
+    if scheduler is None:
+        scheduler = HostScheduler(delay=delay)
+    errors: List[tuple[str, str]] = []
+    if not scheduler.robots_checked(start_url):
+        crawl_delay, error = _fetch_crawl_delay(session, start_url, timeout=timeout, scheduler=scheduler)
+        if error in UNREACHABLE_ERRORS or scheduler.halted(start_url):
+            # Host unreachable or asked us to stay away: don't touch the homepage.
+            return PageResult(
+                url=start_url,
+                emails=(),
+                social_links={},
+                visited_pages=0,
+                errors=((start_url, error),),
+            )
+        scheduler.set_crawl_delay(start_url, crawl_delay)
     queue: deque[str] = deque([start_url])
     visited: set[str] = set()
     collected_emails: set[str] = set()
     social_links: dict[str, set[str]] = {}
-    errors: List[str] = []
+    retried: set[str] = set()
     pages_processed = 0
 
     while queue and pages_processed < max_pages:
@@ -77,9 +309,19 @@ def crawl_single_site(
             continue
         visited.add(current)
 
-        html, error = _fetch_html(session, current, timeout=timeout)
+        html, error = _fetch_html(session, current, timeout=timeout, scheduler=scheduler)
         if error:
-            errors.append(error)
+            if scheduler.halted(current):
+                errors.append((current, error))
+                queue.clear()
+                continue
+            if _is_retryable_error(error) and current not in retried:
+                # Retry once; _fetch_html waits out the backoff / Retry-After first.
+                retried.add(current)
+                visited.discard(current)
+                queue.appendleft(current)
+                continue
+            errors.append((current, error))
             continue
         if not html:
             continue
@@ -97,15 +339,12 @@ def crawl_single_site(
             if candidate not in visited and _same_domain(candidate, start_url):
                 queue.append(candidate)
 
-        if delay:
-            time.sleep(delay)
-
     return PageResult(
         url=start_url,
-        emails=collected_emails,
-        social_links={k: sorted(v) for k, v in social_links.items()},
+        emails=tuple(sorted(collected_emails)),
+        social_links={k: tuple(sorted(v)) for k, v in social_links.items()},
         visited_pages=pages_processed,
-        errors=errors,
+        errors=tuple(errors),
     )
 
 
@@ -114,25 +353,26 @@ def crawl_contacts(
     max_pages_per_site: int = 5,
     delay: float = 1.0,
     timeout: int = 12,
+    min_delay: float = 0.2,
 ) -> pd.DataFrame:
     if isinstance(websites, pd.DataFrame):
         url_iterable = websites["url"].tolist() if "url" in websites.columns else websites.iloc[:, 0].tolist()
     else:
         url_iterable = list(websites)
 
-    results: List[PageResult] = []
+    scheduler = HostScheduler(delay=delay, min_delay=min_delay)
+    columns = ResultColumns()
     for url in url_iterable:
         site_url = normalize_url(url)
-        result = crawl_single_site(site_url, max_pages=max_pages_per_site, delay=delay, timeout=timeout)
-        results.append(result)
-
-    rows = []
-    for result in results:
-        row = asdict(result)
-        row["emails"] = sorted(result.emails)
-        row["social_links"] = result.social_links
-        row["error"] = "\n".join(result.errors)
-        row.pop("errors", None)
-        rows.append(row)
-
-    return pd.DataFrame(rows)
+        result = crawl_single_site(
+            site_url,
+            max_pages=max_pages_per_site,
+            delay=delay,
+            timeout=timeout,
+            scheduler=scheduler,
+        )
+        # Sites are crawled one after another; a finished host's state is dead weight.
+        scheduler.forget(site_url)
+        columns.append(result)
+
+    return columns.to_frame()
@@ -0,0 +1,202 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+import crawler
+from crawler import HostScheduler, _parse_retry_after, crawl_single_site
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = {"Content-Type": "text/html; charset=utf-8", **(headers or {})}
+        self.apparent_encoding = "utf-8"
+        self.encoding = None
+
+
+class FakeSession:
+    """Serves queued responses (or exceptions) per URL and logs request times."""
+
+    def __init__(self, clock, routes):
+        self.clock = clock
+        self.routes = {url: list(items) for url, items in routes.items()}
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append((url, self.clock.now))
+        items = self.routes.get(url) or [FakeResponse(404)]
+        item = items.pop(0) if len(items) > 1 else items[0]
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(crawler, "time", fake)
+    return fake
+
+
+def test_backoff_doubles_and_caps_at_max_delay(clock):
+    scheduler = HostScheduler(delay=1.0, max_delay=5.0)
+    url = "https://example.com/"
+
+    scheduler.record(url, 503, 0.1)
+    assert scheduler.current_delay(url) == 2.0
+    scheduler.record(url, 429, 0.1)
+    assert scheduler.current_delay(url) == 4.0
+    scheduler.record(url, 520, 0.1)
+    assert scheduler.current_delay(url) == 5.0
+    scheduler.record(url, None, 0.1)
+    assert scheduler.current_delay(url) == 5.0
+
+    scheduler.wait(url)
+    assert clock.sleeps == [5.0]
+
+
+def test_fast_responses_speed_up_to_floor(clock):
+    scheduler = HostScheduler(delay=1.0, min_delay=0.2)
+    url = "https://example.com/"
+
+    scheduler.record(url, 200, 2.0)
+    assert scheduler.current_delay(url) == 1.0
+    for _ in range(20):
+        scheduler.record(url, 200, 0.1)
+    assert scheduler.current_delay(url) == pytest.approx(0.2)
+
+
+def test_retry_after_is_honored(clock):
+    scheduler = HostScheduler(delay=1.0)
+    url = "https://example.com/"
+
+    scheduler.record(url, 503, 0.1, retry_after=10.0)
+    scheduler.wait(url)
+    assert clock.sleeps == [10.0]
+    assert not scheduler.halted(url)
+
+
+def test_retry_after_beyond_max_delay_halts_host(clock):
+    scheduler = HostScheduler(delay=1.0, max_delay=60.0)
+    url = "https://example.com/"
+
+    scheduler.record(url, 429, 0.1, retry_after=3600.0)
+    assert scheduler.halted(url)
+    scheduler.forget(url)
+    assert not scheduler.halted(url)
+
+
+def test_crawl_delay_sets_floor_for_www_and_bare_host(clock):
+    scheduler = HostScheduler(delay=1.0, min_delay=0.2)
+    scheduler.set_crawl_delay("https://example.com/", 5)
+
+    url = "https://www.example.com/contact"
+    assert scheduler.robots_checked(url)
+    assert scheduler.current_delay(url) == 5.0
+    scheduler.record(url, 200, 0.1)
+    assert scheduler.current_delay(url) == 5.0
+
+
+@pytest.mark.parametrize("delay", [1.0, 0.0])
+def test_crawl_delay_applies_to_request_after_robots(clock, delay):
+    scheduler = HostScheduler(delay=delay)
+    url = "https://example.com/"
+
+    scheduler.record("https://example.com/robots.txt", 200, 0.1)
+    scheduler.set_crawl_delay(url, 2)
+    scheduler.wait(url)
+    assert clock.now == 2.0
+
+
+def test_parse_retry_after_formats():
+    assert _parse_retry_after("120") == 120.0
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert _parse_retry_after(format_datetime(retry_at, usegmt=True)) == pytest.approx(30, abs=2)
+    assert _parse_retry_after("soon") is None
+
+
+def _crawl(monkeypatch, clock, routes, delay=1.0):
+    session = FakeSession(clock, routes)
+    monkeypatch.setattr(crawler, "_build_session", lambda timeout=12: session)
+    result = crawl_single_site("https://example.com/", max_pages=3, delay=delay)
+    return result, session
+
+
+def test_robots_crawl_delay_spaces_homepage(monkeypatch, clock):
+    result, session = _crawl(
+        monkeypatch,
+        clock,
+        {
+            "https://example.com/robots.txt": [FakeResponse(200, "User-agent: *\nCrawl-delay: 2\n")],
+            "https://example.com/": [FakeResponse(200, "<html></html>")],
+        },
+    )
+    assert result.visited_pages == 1
+    assert [t for _, t in session.calls] == [0.0, 2.0]
+
+
+def test_homepage_503_is_retried_after_retry_after(monkeypatch, clock):
+    result, session = _crawl(
+        monkeypatch,
+        clock,
+        {
+            "https://example.com/": [
+                FakeResponse(503, headers={"Retry-After": "3"}),
+                FakeResponse(200, "<html></html>"),
+            ],
+        },
+    )
+    assert result.visited_pages == 1
+    assert result.errors == ()
+    homepage_times = [t for url, t in session.calls if url == "https://example.com/"]
+    assert homepage_times[1] - homepage_times[0] >= 3.0
+
+
+def test_long_retry_after_stops_crawling_host(monkeypatch, clock):
+    result, session = _crawl(
+        monkeypatch,
+        clock,
+        {"https://example.com/": [FakeResponse(429, headers={"Retry-After": "3600"})]},
+    )
+    assert result.visited_pages == 0
+    assert result.errors == (("https://example.com/", "HTTP 429"),)
+    assert [url for url, _ in session.calls].count("https://example.com/") == 1
+
+
+def test_robots_timeout_still_crawls_homepage(monkeypatch, clock):
+    result, _ = _crawl(
+        monkeypatch,
+        clock,
+        {
+            "https://example.com/robots.txt": [requests.Timeout("read timed out")],
+            "https://example.com/": [FakeResponse(200, "<html></html>")],
+        },
+    )
+    assert result.visited_pages == 1
+
+
+def test_robots_dns_failure_skips_site(monkeypatch, clock):
+    result, session = _crawl(
+        monkeypatch,
+        clock,
+        {"https://example.com/robots.txt": [requests.ConnectionError("NameResolutionError")]},
+    )
+    assert result.visited_pages == 0
+    assert result.errors == (("https://example.com/", "DNS"),)
+    assert len(session.calls) == 1
@@ -1,6 +1,7 @@
 import io
 import re
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 from typing import Iterable, List, Set, Tuple
 from urllib.parse import urljoin, urlparse
 
@@ -224,11 +225,58 @@ def load_website_list(source) -> pd.DataFrame:
     return pd.DataFrame({"url": sorted(urls)})
 
 
-@dataclass
+@dataclass(slots=True)
 class PageResult:
+    """
+    Compact per-site result. Errors are (page_url, error_code) pairs whose
+    codes are interned, so repeated failures share one string object.
+    """
+
     url: str
-    emails: Set[str]
-    social_links: dict
+    emails: Tuple[str, ...]
+    social_links: dict[str, Tuple[str, ...]]
     visited_pages: int
-    errors: List[str]
+    errors: Tuple[Tuple[str, str], ...]
+
+    def format_errors(self) -> str:
+        return "\n".join(f"{page}: {code}" for page, code in self.errors)
+
+
+def intern_error_code(code: str) -> str:
+    return sys.intern(code)
+
+
+@dataclass(slots=True)
+class ResultColumns:
+    """
+    Columnar buffer for crawl results, filled site by site so the full list of
+    PageResult objects never has to be kept around or converted through asdict.
+    """
+
+    url: List[str] = field(default_factory=list)
+    emails: List[List[str]] = field(default_factory=list)
+    social_links: List[dict] = field(default_factory=list)
+    visited_pages: List[int] = field(default_factory=list)
+    error: List[str] = field(default_factory=list)
+
+    def append(self, result: PageResult) -> None:
+        self.url.append(result.url)
+        self.emails.append(list(result.emails))
+        self.social_links.append({k: list(v) for k, v in result.social_links.items()})
+        self.visited_pages.append(result.visited_pages)
+        self.error.append(result.format_errors())
+
+    def __len__(self) -> int:
+        return len(self.url)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "url": self.url,
+                "emails": self.emails,
+                "social_links": self.social_links,
+                "visited_pages": self.visited_pages,
+                "error": self.error,
+            }
+        )
 